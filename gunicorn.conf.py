@@ -0,0 +1,108 @@
+"""Production sunucu profili: gunicorn altında uvicorn worker'ları.
+
+Kullanım:
+    gunicorn -c gunicorn.conf.py main:app
+
+Ayarlar ortam değişkenleriyle ezilebilir:
+    PORT, WEB_CONCURRENCY, GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT,
+    GUNICORN_KEEPALIVE, GUNICORN_MAX_REQUESTS, LOG_LEVEL
+"""
+import math
+import os
+import time
+
+from logging_config import format_process_memory
+
+_config_loaded_at = time.monotonic()
+
+# Bağlantı
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+
+def _usable_cpus() -> int:
+    """Sürecin gerçekten kullanabildiği CPU sayısı (affinity ve cgroup kotası dahil).
+
+    Container içinde os.cpu_count() host'un CPU sayısını döndürür.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        # cgroup v2: "<quota> <period>" veya "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                quota = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if quota > 0:
+                cpus = min(cpus, math.ceil(quota / period))
+        except (OSError, ValueError):
+            pass
+
+    return max(cpus, 1)
+
+
+# Worker'lar: FastAPI async route'ları için uvicorn worker sınıfı. Engelleyen
+# işler threadpool'da koştuğundan kullanılabilir CPU başına bir worker yeterlidir;
+# WEB_CONCURRENCY ile ezilebilir.
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", str(_usable_cpus())))
+
+# Uygulama master'da bir kez import edilir; fork sonrası worker'lar
+# import edilmiş modülleri copy-on-write ile paylaşır. Ağ istemcileri ve
+# bağlantı havuzları ise her worker'da lifespan içinde kurulur (bkz. main.py).
+preload_app = True
+
+# Zaman aşımları: uzun OCR işleri için geniş tutulur. SIGTERM geldiğinde
+# uvicorn yeni bağlantı almayı bırakır ve açık istekler kapanana kadar bekler;
+# graceful_timeout dolunca kalan istekler iptal edilir. Platformun durdurma
+# süresi (docker stop -t, stop_grace_period, terminationGracePeriodSeconds)
+# bu değerden kısa olmamalıdır, yoksa işler SIGKILL ile kesilir.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "120"))
+
+# Bellek sızıntılarına karşı worker'ları belirli istek sayısından sonra yenile
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# Loglama
+loglevel = os.getenv("LOG_LEVEL", "info")
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Master hazır olduğunda açılış süresini ve belleğini loglar."""
+    elapsed_ms = (time.monotonic() - _config_loaded_at) * 1000
+    server.log.info(
+        f"Server startup - {elapsed_ms:.2f}ms "
+        f"workers={server.num_workers} preload={preload_app} master {format_process_memory()}"
+    )
+
+
+def pre_fork(server, worker):
+    worker._forked_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    """Her worker için fork'tan hazır olmaya kadar geçen süreyi ve belleğini loglar.
+
+    Bu ölçüm lifespan'den önce alınır; istemciler kurulduktan sonraki bellek
+    main.py'deki lifespan'de "Worker ... hazır" satırında loglanır.
+    """
+    forked_at = getattr(worker, "_forked_at", _config_loaded_at)
+    elapsed_ms = (time.monotonic() - forked_at) * 1000
+    worker.log.info(f"Worker startup - {elapsed_ms:.2f}ms pid={worker.pid} {format_process_memory()}")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} çıktı")
@@ -18,3 +18,33 @@ def log_api_request(path, method, client_ip, user_agent):
 
 def log_performance(action, ms, extra=""):
     logging.info(f"{action} - {ms:.2f}ms {extra}")
+
+
+def process_memory_mb():
+    """Sürecin bellek kullanımını MB olarak döndürür (Linux, /proc/self/smaps_rollup).
+
+    rss: master ile copy-on-write paylaşılan sayfalar dahil.
+    pss: paylaşılan sayfalar paylaşan süreçlere bölünmüş.
+    uss: yalnızca bu sürece ait (Private_*) sayfalar; worker'ın gerçek maliyeti.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+    return {
+        "rss": fields.get("Rss", 0) / 1024,
+        "pss": fields.get("Pss", 0) / 1024,
+        "uss": (fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024,
+    }
+
+
+def format_process_memory():
+    mem = process_memory_mb()
+    if not mem:
+        return "mem=n/a"
+    return " ".join(f"{key}={value:.1f}MB" for key, value in mem.items())
@@ -6,6 +6,8 @@ import logging
 import imghdr
 import time
 import inspect
+import threading
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from io import BytesIO
 
@@ -14,6 +16,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from azure.storage.blob import BlobServiceClient, ContentSettings
 from azure.core.credentials import AzureKeyCredential
@@ -23,6 +26,8 @@ import pyodbc
 import requests
 from dotenv import load_dotenv
 
+from logging_config import format_process_memory
+
 # Pillow for image processing
 try:
     from PIL import Image
@@ -39,11 +44,79 @@ logging.basicConfig(
 )
 log = logging.getLogger("belgededektif")
 
+# ODBC sürücü yöneticisi bağlantı havuzu: pyodbc.connect() kapatılan
+# bağlantıları süreç içinde yeniden kullanır, yani her worker kendi havuzunu
+# tutar. İlk bağlantıdan önce ayarlanmalıdır.
+pyodbc.pooling = True
+
+# Worker başına paylaşılan istemciler. preload_app ile master'da import edilse
+# bile istemciler fork sonrası her worker'ın lifespan'inde kurulur.
+# requests.Session thread-safe olmadığından her threadpool thread'i kendi
+# oturumunu kullanır (OCR REST çağrıları); kapanışta hepsi kapatılır.
+_azure_clients = None
+_azure_config_error: Optional[str] = None
+_http_local = threading.local()
+_http_sessions: List[requests.Session] = []
+_http_sessions_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Çağıran thread'e ait HTTP oturumunu döndürür."""
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _http_local.session = session
+        with _http_sessions_lock:
+            _http_sessions.append(session)
+    return session
+
+
+def _create_azure_clients():
+    connect_str = os.environ["AZURE_STORAGE_CONNECTION_STRING"]
+    container_name = os.environ.get("AZURE_CONTAINER_NAME", "belgededektif")
+
+    blob_service_client = BlobServiceClient.from_connection_string(connect_str)
+    return blob_service_client, container_name
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Worker başına Blob istemcisini kurar, kapanışta istemcileri ve oturumları kapatır."""
+    global _azure_clients, _azure_config_error
+    # Hatalı yapılandırma worker'ı düşürmez (gunicorn tüm sunucuyu durdururdu);
+    # hata get_azure_clients üzerinden yüklemelerde 500 olarak döner
+    try:
+        _azure_clients = _create_azure_clients()
+        _azure_config_error = None
+    except KeyError as e:
+        _azure_clients = None
+        _azure_config_error = f"Sunucu yapılandırma hatası: {e} ortam değişkeni eksik."
+        log.warning(_azure_config_error)
+    except Exception as e:
+        _azure_clients = None
+        _azure_config_error = f"Sunucu yapılandırma hatası: Blob istemcisi oluşturulamadı: {e}"
+        log.warning(_azure_config_error)
+    log.info(f"Worker {os.getpid()} hazır - {format_process_memory()}")
+
+    try:
+        yield
+    finally:
+        if _azure_clients is not None:
+            blob_service_client, _ = _azure_clients
+            blob_service_client.close()
+            _azure_clients = None
+        with _http_sessions_lock:
+            for session in _http_sessions:
+                session.close()
+            _http_sessions.clear()
+
+
 # FastAPI app
 app = FastAPI(
     title="BelgeDedektif API",
     description="Belgeleri yapay zeka ile analiz edip yöneten gelişmiş API.",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -147,25 +220,13 @@ def normalize_image_bytes(data: bytes) -> bytes:
 
 
 def get_azure_clients():
-    """Azure istemcilerini döndürür."""
-    try:
-        connect_str = os.environ["AZURE_STORAGE_CONNECTION_STRING"]
-        container_name = os.environ.get("AZURE_CONTAINER_NAME", "belgededektif")
-        vision_endpoint = os.environ["AZURE_OCR_ENDPOINT"].rstrip("/")
-        vision_key = os.environ["AZURE_OCR_KEY"]
-
-        blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-        vision_client = ImageAnalysisClient(
-            endpoint=vision_endpoint,
-            credential=AzureKeyCredential(vision_key)
-        )
-
-        return blob_service_client, container_name, vision_client
-    except KeyError as e:
+    """Worker'ın lifespan'de kurduğu Blob istemcisini ve container adını döndürür."""
+    if _azure_clients is None:
         raise HTTPException(
             status_code=500,
-            detail=f"Sunucu yapılandırma hatası: {e} ortam değişkeni eksik."
+            detail=_azure_config_error or "Sunucu yapılandırma hatası: Azure istemcileri hazır değil."
         )
+    return _azure_clients
 
 
 def get_db_connection():
@@ -193,6 +254,7 @@ def vision_read_bytes(image_bytes: bytes, timeout_sec: int = 30) -> str:
     try:
         endpoint = os.environ["AZURE_OCR_ENDPOINT"].rstrip("/")
         key = os.environ["AZURE_OCR_KEY"]
+        http = get_http_session()
 
         # 1. Analyze isteği
         url = f"{endpoint}/vision/v3.2/read/analyze"
@@ -201,7 +263,7 @@ def vision_read_bytes(image_bytes: bytes, timeout_sec: int = 30) -> str:
             "Content-Type": "application/octet-stream"
         }
 
-        response = requests.post(url, headers=headers, data=image_bytes, timeout=20)
+        response = http.post(url, headers=headers, data=image_bytes, timeout=20)
         response.raise_for_status()
 
         operation_location = response.headers.get("Operation-Location")
@@ -213,7 +275,7 @@ def vision_read_bytes(image_bytes: bytes, timeout_sec: int = 30) -> str:
         while time.time() < deadline:
             time.sleep(1.5)
 
-            poll_response = requests.get(
+            poll_response = http.get(
                 operation_location,
                 headers={"Ocp-Apim-Subscription-Key": key},
                 timeout=20
@@ -250,7 +312,7 @@ def vision_read_bytes(image_bytes: bytes, timeout_sec: int = 30) -> str:
 def save_to_blob(filename: str, data: bytes, mime_type: str) -> str:
     """Dosyayı Azure Blob Storage'a kaydeder."""
     try:
-        blob_service_client, container_name, _ = get_azure_clients()
+        blob_service_client, container_name = get_azure_clients()
 
         # Dosya adı ve yol oluştur
         today = datetime.datetime.utcnow()
@@ -410,16 +472,18 @@ async def upload_and_analyze_document(file: UploadFile = File(...)):
                 status_code=400,
                 detail="Geçersiz görüntü formatı. Lütfen gerçek bir PNG/JPEG/GIF yükleyin."
             )
-        contents = normalize_image_bytes(contents)
+        contents = await run_in_threadpool(normalize_image_bytes, contents)
 
     try:
-        blob_url = save_to_blob(
+        blob_url = await run_in_threadpool(
+            save_to_blob,
             file.filename or "upload",
             contents,
             file.content_type or "application/octet-stream"
         )
 
-        doc_id = create_document_record(
+        doc_id = await run_in_threadpool(
+            create_document_record,
             file.filename or "upload",
             len(contents),
             file.content_type or "application/octet-stream",
@@ -429,11 +493,11 @@ async def upload_and_analyze_document(file: UploadFile = File(...)):
 
         try:
             if file_ext in SUPPORTED_IMAGE_TYPES:
-                ocr_text = vision_read_bytes(contents)
+                ocr_text = await run_in_threadpool(vision_read_bytes, contents)
             else:
                 ocr_text = "Bu dosya türü için OCR henüz desteklenmiyor."
 
-            update_document_record(doc_id, "succeeded", ocr_text)
+            await run_in_threadpool(update_document_record, doc_id, "succeeded", ocr_text)
 
             return {
                 "id": doc_id,
@@ -445,7 +509,7 @@ async def upload_and_analyze_document(file: UploadFile = File(...)):
             }
 
         except Exception as ocr_error:
-            update_document_record(doc_id, "failed", str(ocr_error))
+            await run_in_threadpool(update_document_record, doc_id, "failed", str(ocr_error))
             raise HTTPException(
                 status_code=500,
                 detail=f"OCR işlemi başarısız: {str(ocr_error)}"
@@ -575,4 +639,9 @@ def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=int(os.getenv("PORT", "8000")), reload=True)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        reload=os.getenv("UVICORN_RELOAD", "0") == "1"
+    )